@@ -5,6 +5,7 @@ This program contains the base class and subclasses for geological features.
 """
 
 from abc import ABC
+from array import array
 from dataclasses import dataclass
 
 @dataclass
@@ -177,4 +178,186 @@ class Crater(GeoFeature):
         return self.perimeter
 
     def __str__(self):
-        return "crater"
\ No newline at end of file
+        return "crater"
+
+
+def parse_feature(line):
+    """
+    Creates the geological feature described by one line of a map file
+
+    Arguments:
+        line (str): CSV line of the form row,col,type,name,dimension
+
+    Returns:
+        GeoFeature: the corresponding child class, or None for an unknown type
+    """
+    data = line.strip().split(",")
+
+    location = (int(data[0]), int(data[1]))
+    geo_type = data[2]
+    geo_name = data[3]
+    geo_dimension = int(data[4])
+
+    # Using conditional statements, to create corresponding child class
+    if geo_type == "mountain":
+        return Mountain(location, geo_name, geo_dimension)
+
+    elif geo_type == "lake":
+        return Lake(location, geo_name, geo_dimension)
+        
+    elif geo_type == "crater":
+        return Crater(location, geo_name, geo_dimension)
+
+    return None
+
+
+class FeatureLookup:
+    """
+    Precomputed lookup tables for the info and representation of every cell on the map, so
+    repeated queries become array lookups instead of rebuilding strings per feature.
+
+    Instance Variables:
+        length (int): Length of the grid
+        width (int): Width of the grid
+        info_strings (list): interned info strings, index 0 is "no information found"
+        representations (list): map representation for each type code, code 0 is "."
+        info_grid (array): flat grid of indices into info_strings
+        type_grid (array): flat grid of type codes indexing into representations
+    """
+
+    def __init__(self, map_list):
+        """
+        Builds the lookup tables from a map
+
+        Arguments:
+            map_list: list of lists containing geological features of locations
+        """
+        self.map_list = map_list
+        self.length = len(map_list)
+        self.width = len(map_list[0])
+        self.invalidate()
+
+    def invalidate(self, location=None):
+        """
+        Rebuilds the tables for a single cell, or for the whole map if no location is given
+
+        Arguments:
+            location (tuple): optional (row, col) of the cell that changed
+        """
+        if location is not None:
+            row, col = location
+            self._store(row, col, self.map_list[row][col])
+            return
+
+        # Empty cells share code 0 and the base class info string
+        self.info_strings = [GeoFeature.info]
+        self.representations = [GeoFeature.representation]
+        self._info_codes = {GeoFeature.info: 0}
+        self._type_codes = {GeoFeature.representation: 0}
+
+        self.info_grid = array("I", bytes(4 * self.length * self.width))
+        self.type_grid = array("B", bytes(self.length * self.width))
+
+        for row in range(self.length):
+            for col in range(self.width):
+                feature = self.map_list[row][col]
+
+                if str(feature) != "GeoFeature":
+                    self._store(row, col, feature)
+
+    def _store(self, row, col, feature):
+        """
+        Interns the info and representation of a feature and records their codes for a cell
+        """
+        info = feature.get_info()
+        info_code = self._info_codes.get(info)
+
+        if info_code is None:
+            info_code = len(self.info_strings)
+            self._info_codes[info] = info_code
+            self.info_strings.append(info)
+
+        representation = feature.get_representation()
+        type_code = self._type_codes.get(representation)
+
+        if type_code is None:
+            type_code = len(self.representations)
+            self._type_codes[representation] = type_code
+            self.representations.append(representation)
+
+        index = self._index(row, col)
+        self.info_grid[index] = info_code
+        self.type_grid[index] = type_code
+
+    def _normalise(self, row, col):
+        """
+        Returns a location with negative indices counted from the end, raising IndexError for
+        locations off the map the same way as map_list[row][col]
+        """
+        if not (-self.length <= row < self.length and -self.width <= col < self.width):
+            raise IndexError(f"location ({row},{col}) is outside the map")
+
+        return row % self.length, col % self.width
+
+    def _index(self, row, col):
+        """
+        Returns the flat grid index of a cell
+        """
+        row, col = self._normalise(row, col)
+
+        return row * self.width + col
+
+    def get_info(self, row, col):
+        """
+        Returns the info string of the feature at a cell
+
+        Returns:
+            string: information about the geological feature
+        """
+        return self.info_strings[self.info_grid[self._index(row, col)]]
+
+    def get_representation(self, row, col):
+        """
+        Returns the map representation of the feature at a cell
+
+        Returns:
+            string: Graphical representation of the geological feature for the map
+        """
+        return self.representations[self.type_grid[self._index(row, col)]]
+
+    def get_info_region(self, top, left, bottom, right):
+        """
+        Returns the info strings for a rectangle of cells between two corners, bounds inclusive.
+        Corners may be given in any order and are read the same way as get_info, so negative
+        indices count from the end and corners off the map raise IndexError.
+
+        Returns:
+            list: list of (location, info) tuples in row-major order
+        """
+        top, left = self._normalise(top, left)
+        bottom, right = self._normalise(bottom, right)
+        top, bottom = sorted((top, bottom))
+        left, right = sorted((left, right))
+
+        region = []
+
+        for row in range(top, bottom + 1):
+            offset = row * self.width
+
+            for col in range(left, right + 1):
+                region.append(((row, col), self.info_strings[self.info_grid[offset + col]]))
+
+        return region
+
+    def representation_rows(self):
+        """
+        Returns each row of the map as a single string of representations
+        """
+        rows = []
+
+        for row in range(self.length):
+            offset = row * self.width
+            codes = self.type_grid[offset:offset + self.width]
+            rows.append("".join([self.representations[code] for code in codes]))
+
+        return rows
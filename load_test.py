@@ -0,0 +1,205 @@
+"""
+Name - Suveer Dhawan
+
+This program drives the user_explore command dispatcher with a generated mix of commands
+against a synthetic map, and reports throughput and latency for each command type. It runs
+entirely in process, so no terminal is needed.
+"""
+
+import argparse
+import contextlib
+import os
+import random
+import time
+
+import geo_features
+import robot
+import user_explore
+
+COMMAND_TYPES = ("info", "moveto", "explore", "mission", "display journey")
+DEFAULT_MIX = "info=40,moveto=20,explore=20,mission=10,display journey=10"
+
+
+def synthetic_map(height, width, density, seed=None):
+    """
+    Creates a map_list of the given size with randomly placed features, in the same form
+    as create_map
+
+    Parameters:
+        height (int): Length of the grid
+        width (int): Width of the grid
+        density (float): fraction of locations holding a feature
+        seed (int): seed for the random placement
+
+    Returns:
+        map_list: list of lists containing geological features of locations
+    """
+    rng = random.Random(seed)
+    feature_types = [geo_features.Mountain, geo_features.Lake, geo_features.Crater]
+
+    map_list = []
+
+    for row in range(height):
+        map_row = []
+
+        for col in range(width):
+            location = (row, col)
+
+            if rng.random() < density:
+                geo_type = rng.choice(feature_types)
+                name = f"feature {row}-{col}"
+                map_row.append(geo_type(location, name, rng.randint(1, 100)))
+
+            else:
+                map_row.append(geo_features.GeoFeature(location))
+
+        map_list.append(map_row)
+
+    return map_list
+
+
+def parse_mix(mix_string):
+    """
+    Parses a command mix such as "info=40,moveto=20" into a dictionary of weights, raising
+    ValueError for unknown command types
+    """
+    mix = {}
+
+    for item in mix_string.split(","):
+        command, weight = item.split("=")
+        command = command.strip()
+
+        if command not in COMMAND_TYPES:
+            raise ValueError(f"unknown command type '{command}', expected one of "
+                             f"{', '.join(COMMAND_TYPES)}")
+
+        mix[command] = float(weight)
+
+    return mix
+
+
+def generate_commands(map_list, mix, count, seed=None):
+    """
+    Generates a list of user commands drawn from a weighted mix of command types
+
+    Parameters:
+        map_list: list of lists containing geological features of locations
+        mix (dictionary): weight for each command type
+        count (int): number of commands to generate
+        seed (int): seed for the random commands
+
+    Returns:
+        list: (command type, user input) tuples
+    """
+    rng = random.Random(seed)
+    height = len(map_list)
+    width = len(map_list[0])
+
+    names = [feature.name for row in map_list for feature in row
+             if str(feature) != "GeoFeature"]
+
+    # A mission with no features is ignored by the dispatcher, so it would only time a no-op
+    if not names and mix.get("mission"):
+        raise ValueError("mission commands need a map with at least one feature")
+
+    command_types = list(mix)
+    weights = [mix[command_type] for command_type in command_types]
+    commands = []
+
+    for command_type in rng.choices(command_types, weights, k=count):
+
+        if command_type == "info":
+            user_input = f"info {rng.randrange(height)} {rng.randrange(width)}"
+
+        elif command_type == "moveto":
+            user_input = f"moveto {rng.randrange(height)} {rng.randrange(width)}"
+
+        elif command_type == "mission":
+            mission = rng.sample(names, min(len(names), rng.randint(1, 4)))
+            user_input = "mission " + ",".join(mission)
+
+        else:
+            user_input = command_type
+
+        commands.append((command_type, user_input))
+
+    return commands
+
+
+def run_load(commands, robot_object, map_list, map_lookup):
+    """
+    Runs every command through the dispatcher, timing each one with its output discarded
+
+    Returns:
+        tuple: (latencies, elapsed) where latencies maps each command type to a list of
+            seconds taken and elapsed is the total wall time in seconds
+    """
+    latencies = {}
+
+    with open(os.devnull, "w") as sink, contextlib.redirect_stdout(sink):
+        start = time.perf_counter()
+
+        for command_type, user_input in commands:
+            command_start = time.perf_counter()
+            user_explore.run_command(user_input, robot_object, map_list, map_lookup)
+            latencies.setdefault(command_type, []).append(time.perf_counter() - command_start)
+
+        elapsed = time.perf_counter() - start
+
+    return latencies, elapsed
+
+
+def percentile(sorted_values, percent):
+    """
+    Returns the nearest-rank percentile of an already sorted list
+    """
+    rank = max(1, -(-len(sorted_values) * percent // 100))
+    return sorted_values[int(rank) - 1]
+
+
+def build_report(latencies, elapsed):
+    """
+    Builds the report lines with throughput and p50/p95/p99 latency per command type
+    """
+    total = sum(len(values) for values in latencies.values())
+    lines = [f"{total} commands in {elapsed:.3f}s ({total / elapsed:.1f} commands/s)",
+             f"{'command':<16}{'count':>8}{'ops/s':>12}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"]
+
+    for command_type, values in sorted(latencies.items()):
+        values = sorted(values)
+        # Throughput of each command type within the mix, over the whole run
+        throughput = len(values) / elapsed
+        p50, p95, p99 = [percentile(values, percent) * 1000 for percent in (50, 95, 99)]
+
+        lines.append(f"{command_type:<16}{len(values):>8}{throughput:>12.1f}"
+                     f"{p50:>10.3f}{p95:>10.3f}{p99:>10.3f}")
+
+    return lines
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="Load test the Robbie command dispatcher")
+    parser.add_argument("--height", type=int, default=500)
+    parser.add_argument("--width", type=int, default=500)
+    parser.add_argument("--density", type=float, default=0.01)
+    parser.add_argument("--commands", type=int, default=5000)
+    parser.add_argument("--mix", default=DEFAULT_MIX)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    # Building the synthetic map, Robbie and the lookup tables the same way as user_explore
+    map_list = synthetic_map(args.height, args.width, args.density, args.seed)
+    robbie = robot.Robot(map_list)
+    map_lookup = geo_features.FeatureLookup(map_list)
+
+    try:
+        commands = generate_commands(map_list, parse_mix(args.mix), args.commands, args.seed)
+
+    except ValueError as error:
+        parser.error(str(error))
+
+    latencies, elapsed = run_load(commands, robbie, map_list, map_lookup)
+
+    for line in build_report(latencies, elapsed):
+        print(line)
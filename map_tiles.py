@@ -0,0 +1,394 @@
+"""
+Name - Suveer Dhawan
+
+This program splits a map file into fixed-size tiles on disk and loads them lazily through
+an LRU tile cache, so maps too big to hold in memory can still be explored. Tiles can be
+prefetched in the background ahead of a planned move or mission.
+"""
+
+import argparse
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import geo_features
+
+MANIFEST_FILE = "manifest.txt"
+NAMES_FILE = "names.txt"
+OPEN_TILE_FILES = 64
+
+
+def tile_path(tile_dir, tile_key):
+    """
+    Returns the path of the file holding a tile
+
+    Parameters:
+        tile_dir (str): directory holding the tiled map
+        tile_key (tuple): (tile row, tile col) of the tile
+    """
+    return os.path.join(tile_dir, f"tile_{tile_key[0]}_{tile_key[1]}.txt")
+
+
+def write_tiles(ref_file, tile_dir, tile_size):
+    """
+    Splits a map file into a tiled map directory. The manifest holds the map size and tile
+    size, names.txt indexes feature names to locations, and each tile file holds the feature
+    lines of that tile in the original format. Tiles without features are not written, and
+    any tiled map already in the directory is replaced. Lines are streamed straight into
+    their tile files, so the map is never held in memory.
+
+    Parameters:
+        ref_file (CSV file): CSV file containing location data for the map
+        tile_dir (str): directory to write the tiled map into
+        tile_size (int): number of rows and columns in each tile
+    """
+    os.makedirs(tile_dir, exist_ok=True)
+
+    # Removing the old manifest first so a half-written directory is never loaded, then
+    # any tiles left from an earlier tile size
+    manifest_path = os.path.join(tile_dir, MANIFEST_FILE)
+
+    if os.path.exists(manifest_path):
+        os.remove(manifest_path)
+
+    for file_name in os.listdir(tile_dir):
+        if file_name.startswith("tile_") and file_name.endswith(".txt"):
+            os.remove(os.path.join(tile_dir, file_name))
+
+    # Keeping a bounded set of tile files open for appending, closing the least recently
+    # used one when the limit is reached
+    tile_files = OrderedDict()
+
+    try:
+        with open(ref_file, 'r') as loc_file, \
+                open(os.path.join(tile_dir, NAMES_FILE), 'w') as names_file:
+            header = loc_file.readline().strip().split(",")
+            map_size = geo_features.Size(int(header[0]), int(header[1]))
+
+            for line in loc_file:
+                geo = geo_features.parse_feature(line)
+
+                if geo is None:
+                    continue
+
+                loc_row, loc_col = geo.location
+                tile_key = (loc_row // tile_size, loc_col // tile_size)
+                tile_file = tile_files.get(tile_key)
+
+                if tile_file is None:
+                    if len(tile_files) >= OPEN_TILE_FILES:
+                        tile_files.popitem(last=False)[1].close()
+
+                    tile_file = open(tile_path(tile_dir, tile_key), 'a')
+                    tile_files[tile_key] = tile_file
+
+                tile_files.move_to_end(tile_key)
+                tile_file.write(line.strip() + "\n")
+                names_file.write(f"{loc_row},{loc_col},{geo.name}\n")
+
+    finally:
+        for tile_file in tile_files.values():
+            tile_file.close()
+
+    # Writing the manifest last so a half-written directory is never loaded
+    with open(manifest_path, 'w') as manifest:
+        manifest.write(f"{map_size.height},{map_size.width},{tile_size}\n")
+
+
+class TiledRow:
+    """
+    A single row of a TiledMap, so the map can be indexed as map_list[row][col]
+    """
+
+    def __init__(self, tiled_map, row):
+        self.tiled_map = tiled_map
+        self.row = row
+
+    def __getitem__(self, col):
+        return self.tiled_map.get_feature(self.row, col)
+
+    def __len__(self):
+        return self.tiled_map.width
+
+    def __iter__(self):
+        for col in range(self.tiled_map.width):
+            yield self.tiled_map.get_feature(self.row, col)
+
+
+class TiledMap:
+    """
+    Map backed by a tiled map directory. Tiles are read on demand and kept in an LRU cache,
+    and it can be used both as the map_list and as the map lookup in user_explore.
+
+    Instance Variables:
+        tile_dir (str): directory holding the tiled map
+        length (int): Length of the grid
+        width (int): Width of the grid
+        tile_size (int): number of rows and columns in each tile
+        cache_tiles (int): memory cap, as the most tiles held in memory at once
+    """
+
+    def __init__(self, tile_dir, cache_tiles=64, prefetch_workers=4):
+        """
+        Opens a tiled map directory written by write_tiles
+
+        Arguments:
+            tile_dir (str): directory holding the tiled map
+            cache_tiles (int): most tiles to hold in memory at once
+            prefetch_workers (int): number of background threads loading prefetched tiles
+        """
+        self.tile_dir = tile_dir
+        self.cache_tiles = max(1, cache_tiles)
+        self.prefetch_workers = prefetch_workers
+
+        with open(os.path.join(tile_dir, MANIFEST_FILE), 'r') as manifest:
+            header = manifest.readline().strip().split(",")
+
+        self.length = int(header[0])
+        self.width = int(header[1])
+        self.tile_size = int(header[2])
+
+        self._cache = OrderedDict()
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._executor = None
+
+    def _normalise(self, row, col):
+        """
+        Returns a location with negative indices counted from the end, raising IndexError for
+        locations off the map the same way as map_list[row][col]
+        """
+        if not (-self.length <= row < self.length and -self.width <= col < self.width):
+            raise IndexError(f"location ({row},{col}) is outside the map")
+
+        return row % self.length, col % self.width
+
+    def tile_key(self, row, col):
+        """
+        Returns the (tile row, tile col) of the tile holding a location
+        """
+        return (row // self.tile_size, col // self.tile_size)
+
+    def _read_tile(self, tile_key):
+        """
+        Reads a tile from disk into a dictionary of location to feature
+        """
+        tile = {}
+
+        try:
+            with open(tile_path(self.tile_dir, tile_key), 'r') as tile_file:
+                for line in tile_file:
+                    geo = geo_features.parse_feature(line)
+
+                    # Skipping features that do not belong in this tile
+                    if geo is not None and self.tile_key(*geo.location) == tile_key:
+                        tile[geo.location] = geo
+
+        # Tiles without features are never written
+        except FileNotFoundError:
+            pass
+
+        return tile
+
+    def _insert(self, tile_key, tile):
+        """
+        Adds a tile to the cache, evicting the least recently used tiles over the cap
+        """
+        with self._lock:
+            self._cache[tile_key] = tile
+            self._cache.move_to_end(tile_key)
+            self._pending.pop(tile_key, None)
+
+            while len(self._cache) > self.cache_tiles:
+                self._cache.popitem(last=False)
+
+    def _load(self, tile_key):
+        """
+        Reads a tile and adds it to the cache
+        """
+        tile = self._read_tile(tile_key)
+        self._insert(tile_key, tile)
+
+        return tile
+
+    def get_tile(self, tile_key):
+        """
+        Returns a tile from the cache, waiting on a prefetch or reading it from disk if needed
+        """
+        with self._lock:
+            tile = self._cache.get(tile_key)
+
+            if tile is not None:
+                self._cache.move_to_end(tile_key)
+                return tile
+
+            future = self._pending.get(tile_key)
+
+        if future is not None:
+            return future.result()
+
+        return self._load(tile_key)
+
+    def get_feature(self, row, col):
+        """
+        Returns the feature at a location, or a GeoFeature for an empty location. Negative
+        indices count from the end and locations off the map raise IndexError
+        """
+        row, col = self._normalise(row, col)
+        tile = self.get_tile(self.tile_key(row, col))
+        feature = tile.get((row, col))
+
+        if feature is None:
+            return geo_features.GeoFeature((row, col))
+
+        return feature
+
+    def prefetch(self, locations):
+        """
+        Starts loading the tiles holding the given locations in the background, in order and
+        up to the cache cap so prefetched tiles do not evict each other
+
+        Arguments:
+            locations: list of (row, col) locations about to be visited
+        """
+        tile_keys = []
+
+        for location in locations:
+
+            # Leaving locations off the map to fail when they are actually read
+            try:
+                tile_key = self.tile_key(*self._normalise(*location))
+
+            except IndexError:
+                continue
+
+            if tile_key not in tile_keys:
+                tile_keys.append(tile_key)
+
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.prefetch_workers)
+
+            for tile_key in tile_keys[:self.cache_tiles]:
+                if tile_key not in self._cache and tile_key not in self._pending:
+                    self._pending[tile_key] = self._executor.submit(self._load, tile_key)
+
+    def invalidate(self, location=None):
+        """
+        Drops the cached tile holding a location, or every cached tile if no location is given
+        """
+        with self._lock:
+            if location is None:
+                self._cache.clear()
+
+            else:
+                self._cache.pop(self.tile_key(*location), None)
+
+    def close(self):
+        """
+        Stops the background prefetch threads
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def find_features(self, names):
+        """
+        Finds features by name by scanning the names index, without loading the whole map.
+        Only the requested names are kept, so memory stays within the tile cache. The tiles
+        along the mission route are prefetched in order while the features are resolved.
+
+        Arguments:
+            names (list): feature names to look up
+
+        Returns:
+            list: features matching each name, in the order of names
+        """
+        matches = {name: [] for name in names}
+
+        with open(os.path.join(self.tile_dir, NAMES_FILE), 'r') as names_file:
+            for line in names_file:
+                data = line.rstrip("\n").split(",", 2)
+
+                if len(data) == 3 and data[2] in matches:
+                    matches[data[2]].append((int(data[0]), int(data[1])))
+
+        locations = [location for name in names for location in matches[name]]
+        self.prefetch(locations)
+
+        return [self.get_feature(*location) for location in locations]
+
+    def get_info(self, row, col):
+        """
+        Returns the info string of the feature at a cell
+        """
+        return self.get_feature(row, col).get_info()
+
+    def get_representation(self, row, col):
+        """
+        Returns the map representation of the feature at a cell
+        """
+        return self.get_feature(row, col).get_representation()
+
+    def get_info_region(self, top, left, bottom, right):
+        """
+        Returns the info strings for a rectangle of cells between two corners, bounds inclusive.
+        Corners may be given in any order and are read the same way as get_info, so negative
+        indices count from the end and corners off the map raise IndexError.
+
+        Returns:
+            list: list of (location, info) tuples in row-major order
+        """
+        top, left = self._normalise(top, left)
+        bottom, right = self._normalise(bottom, right)
+        top, bottom = sorted((top, bottom))
+        left, right = sorted((left, right))
+
+        region = []
+
+        for row in range(top, bottom + 1):
+            for col in range(left, right + 1):
+                region.append(((row, col), self.get_info(row, col)))
+
+        return region
+
+    def representation_rows(self):
+        """
+        Yields each row of the map as a single string of representations, reading one band
+        of tiles at a time so each tile is loaded once
+        """
+        for band_start in range(0, self.length, self.tile_size):
+            band_end = min(band_start + self.tile_size, self.length)
+            band = [[geo_features.GeoFeature.representation] * self.width
+                    for _ in range(band_end - band_start)]
+
+            for tile_col in range(0, self.width, self.tile_size):
+                tile = self.get_tile(self.tile_key(band_start, tile_col))
+
+                for (row, col), feature in tile.items():
+                    band[row - band_start][col] = feature.get_representation()
+
+            for row in band:
+                yield "".join(row)
+
+    def __getitem__(self, row):
+        return TiledRow(self, row)
+
+    def __len__(self):
+        return self.length
+
+    def __iter__(self):
+        for row in range(self.length):
+            yield TiledRow(self, row)
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="Split a map file into a tiled map directory")
+    parser.add_argument("map_file")
+    parser.add_argument("tile_dir")
+    parser.add_argument("--tile-size", type=int, default=64)
+    args = parser.parse_args()
+
+    write_tiles(args.map_file, args.tile_dir, args.tile_size)
@@ -8,6 +8,223 @@ into a drone or an AUV.
 
 import geo_features
 import math
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from types import MappingProxyType
+
+
+@dataclass(frozen=True)
+class RobotState:
+    """
+    Frozen snapshot of the parts of a Robot that decide how long a mission takes
+
+    Instance Variables:
+        location (tuple): Position of the robot on the map
+        length (int): Length of the grid
+        width (int): Width of the grid
+        explored_diary (tuple): features explored so far
+        speed_dict (mapping): read-only copy of the exploration speeds at snapshot time
+    """
+    location: tuple
+    length: int
+    width: int
+    explored_diary: tuple
+    speed_dict: MappingProxyType
+
+    def __post_init__(self):
+        # Copying the speeds into nested read-only views so the snapshot cannot be changed
+        speeds = {r_type: MappingProxyType(dict(speeds))
+                  for r_type, speeds in self.speed_dict.items()}
+        object.__setattr__(self, "speed_dict", MappingProxyType(speeds))
+
+    def __reduce__(self):
+        # Read-only views cannot be pickled, so process pool workers rebuild them from dicts
+        speed_copy = {r_type: dict(speeds) for r_type, speeds in self.speed_dict.items()}
+        return (RobotState, (self.location, self.length, self.width,
+                             self.explored_diary, speed_copy))
+
+
+def shortest_step(start, finish, wrapping):
+    """
+    Finds the direction and number of steps of the shortest path between two positions
+    on one axis, accounting for wrapping
+
+    Arguments-
+        start (int): starting position (row/column)
+        finish (int): end position (row/column)
+        wrapping (int): max length/width of grid
+
+    Returns-
+        tuple: (step, count) where step is +1 or -1 and count is the number of steps
+    """
+    forward_moves = (finish - start) % wrapping
+    back_moves = (start - finish) % wrapping
+
+    # Prioritizing shortest distance, and wrapping when paths are equal by forcing
+    # movement in the direction of starting value
+    if forward_moves < back_moves:
+        return 1, forward_moves
+
+    elif forward_moves > back_moves:
+        return -1, back_moves
+
+    elif start < finish:
+        return -1, back_moves
+
+    return 1, forward_moves
+
+
+class JourneyMove:
+    """
+    Compressed record of a single move in the journey. Each straight leg is stored as a
+    direction and a length, so memory grows with the number of legs rather than cells.
+
+    Instance Variables:
+        start_day (int): day count before the move started
+        end_day (int): day count once the move finished
+        start (tuple): position the move started from
+        legs (list): straight legs as (row_step, col_step, count) tuples
+    """
+
+    __slots__ = ("start_day", "end_day", "start", "legs")
+
+    directions = {(-1, 0): "up", (1, 0): "down", (0, -1): "left", (0, 1): "right"}
+
+    def __init__(self, start_day, start):
+        self.start_day = start_day
+        self.end_day = start_day
+        self.start = start
+        self.legs = []
+
+    def add_leg(self, row_step, col_step, count):
+        """
+        Adds a straight leg of count steps in the given direction
+        """
+        if count == 0:
+            return
+
+        self.legs.append((row_step, col_step, count))
+        self.end_day += count
+
+    def day_string(self):
+        """
+        Formats the days taken by the move the same way as the rest of the journey
+        """
+        if self.end_day - self.start_day > 1:
+            return f"Day {self.start_day + 1}-{self.end_day}"
+
+        return f"Day {self.end_day}"
+
+    def expand(self, length, width):
+        """
+        Rebuilds the verbose journey line listing every cell visited
+
+        Arguments-
+            length (int): Length of the grid
+            width (int): Width of the grid
+        """
+        row, col = self.start
+        move_string = f"move {geo_features.Location(row, col)}"
+
+        for row_step, col_step, count in self.legs:
+            for _ in range(count):
+                row = (row + row_step) % length
+                col = (col + col_step) % width
+                move_string += f" -> {geo_features.Location(row, col)}"
+
+        return f"{self.day_string()}: {move_string}"
+
+    def summary(self, length, width):
+        """
+        Builds a compact journey line with one entry per leg
+
+        Arguments-
+            length (int): Length of the grid
+            width (int): Width of the grid
+        """
+        row, col = self.start
+        leg_strings = []
+
+        for row_step, col_step, count in self.legs:
+            row = (row + row_step * count) % length
+            col = (col + col_step * count) % width
+            direction = self.directions[(row_step, col_step)]
+            leg_strings.append(f"{count} {direction} to {geo_features.Location(row, col)}")
+
+        move_string = f"move {geo_features.Location(*self.start)}"
+
+        if leg_strings:
+            move_string += " " + ", ".join(leg_strings)
+
+        return f"{self.day_string()}: {move_string}"
+
+
+class Journey:
+    """
+    Log of the robot's journey. Moves are kept as compressed JourneyMove records and
+    explorations as plain strings, both expanded to text on demand.
+
+    Instance Variables:
+        length (int): Length of the grid
+        width (int): Width of the grid
+        entries (list): JourneyMove records and journey strings in order
+    """
+
+    def __init__(self, length, width):
+        self.length = length
+        self.width = width
+        self.entries = []
+
+    def append(self, entry):
+        """
+        Adds a JourneyMove record or a journey string to the log
+        """
+        self.entries.append(entry)
+
+    def lines(self):
+        """
+        Returns the verbose journey, listing every cell of each move
+        """
+        return [entry if isinstance(entry, str) else entry.expand(self.length, self.width)
+                for entry in self.entries]
+
+    def summary(self):
+        """
+        Returns the compact journey, listing each move by its legs
+        """
+        return [entry if isinstance(entry, str) else entry.summary(self.length, self.width)
+                for entry in self.entries]
+
+    def __len__(self):
+        return len(self.entries)
+
+
+def score_mission(state, explore_list):
+    """
+    Computes the days a mission would take from a snapshot, without touching any robot.
+    Travel time does not depend on the form, so only exploration decides the best form.
+
+    Arguments-
+        state (RobotState): snapshot to evaluate the mission from
+        explore_list: List of features to explore in the mission
+
+    Returns-
+        tuple: (total_days, form) for the mission
+    """
+    travel_days = 0
+    row, col = state.location
+
+    for feature in explore_list:
+        final_row, final_col = feature.location
+        travel_days += shortest_step(col, final_col, state.width)[1]
+        travel_days += shortest_step(row, final_row, state.length)[1]
+        row, col = final_row, final_col
+
+    type_time = Robot.mission_times(explore_list, state.explored_diary, state.speed_dict)
+    fastest = min(type_time, key=type_time.get)
+
+    return travel_days + type_time[fastest], fastest
 
 
 class Robot:
@@ -15,13 +232,14 @@ class Robot:
     The Robot class that is here to explore Mars
 
     Instance Variables:
-        map_list: list of lists containing geological features of locations
+        map_list: list of lists containing geological features of locations, or a map
+            that loads lazily and offers prefetch, such as map_tiles.TiledMap
         length (int): Length of the grid
         width (int): Width of the grid
         
         location (tuple): Position of the robot on the map
         explored_diary (list): list to track features explored on Mars by the Robot 
-        journey (list): log to record the robot's journey
+        journey (Journey): log to record the robot's journey
         total_days (int): tracker for number of days 
         r_type : default type for Robot class instance as robot
 
@@ -52,7 +270,7 @@ class Robot:
         
         self.location = (0,0)
         self.explored_diary = []
-        self.journey = []
+        self.journey = Journey(self.length, self.width)
         self.total_days = 0
         self.r_type = Robot.r_types[0]
         self.mission_log = []
@@ -109,52 +327,38 @@ class Robot:
         Arguments:
             target_loc (tuple): intended target location for robot
         """
+        # Loading the target's part of the map in the background for maps that load lazily,
+        # so exploring on arrival does not wait on disk
+        if hasattr(self.map_list, "prefetch"):
+            self.map_list.prefetch([target_loc])
+
         # Unpacking current and target location
         init_row, init_col = self.location
         final_row, final_col = target_loc
 
-        # Initializing move start day and movement string 
-        # Using geo_features.Location for formatting
-        start_day = self.total_days
-        move_string = f"move {geo_features.Location(*self.location)}"
+        # Recording the move as straight legs instead of every cell visited
+        record = JourneyMove(self.total_days, self.location)
 
         # Preference for Horizontal Movement
         if init_col != final_col:
             
-            # Computing number of moves
-            horizontal = self.move_calculator(init_col, final_col, self.width)
+            # Computing direction and number of moves, using % for wrapping
+            step, count = shortest_step(init_col, final_col, self.width)
+            init_col = (init_col + step * count) % self.width
 
-            # Looping through list of moves
-            for move in horizontal:
-
-                # Using % for wrapping
-                init_col = (init_col + move) % self.width 
-                
-                # Updating class variables and concatenating to movement string
-                self.total_days += 1
-                self.location = (init_row, init_col)          
-                move_string += f" -> {geo_features.Location(*self.location)}"
+            record.add_leg(0, step, count)
 
         # Then looking at Vertical movemement with same logic
         if init_row != final_row:
-            vertical = self.move_calculator(init_row, final_row, self.length)
-            
-            for move in vertical:
-
-                init_row = (init_row + move) % self.length
-                
-                self.total_days += 1
-                self.location = (init_row, init_col)
-                move_string += f" -> {geo_features.Location(*self.location)}"
-
-        # Updating journey log
-        travel_time = self.total_days - start_day
+            step, count = shortest_step(init_row, final_row, self.length)
+            init_row = (init_row + step * count) % self.length
 
-        if travel_time > 1:
-            self.journey.append(f"Day {start_day + 1}-{self.total_days}: {move_string}") 
+            record.add_leg(step, 0, count)
 
-        else:
-            self.journey.append(f"Day {self.total_days}: {move_string}")
+        # Updating location, days and journey log
+        self.location = (init_row, init_col)
+        self.total_days = record.end_day
+        self.journey.append(record)
 
 
     def move_calculator(self, start, finish, wrapping):
@@ -170,26 +374,10 @@ class Robot:
             move_list: List of moves denoted by +1 or -1 for forward or backward steps 
             taken by Robbie
         """
-        # Computing forward or backward movements accounting for wrapping
-        forward_moves = (finish - start) % wrapping
-        back_moves = (start - finish) % wrapping
-
-        # Prioritizing shortest distance
-        if forward_moves < back_moves:
-            move_list = [1] * forward_moves
-
-        elif forward_moves > back_moves:
-            move_list = [-1] * back_moves
-
-        # Prioritizing wrapping when paths are equal by forcing movememnt 
-        # in the direction of starting value
-        else:
-            if start < finish:
-                move_list = [-1] * back_moves
-            else:
-                move_list = [1] * forward_moves
+        # Computing the shortest direction accounting for wrapping
+        step, count = shortest_step(start, finish, wrapping)
 
-        return move_list
+        return [step] * count
 
 
     def explore(self, feature):
@@ -233,41 +421,100 @@ class Robot:
         Returns-
             fastest(str): best form of the robot for this mission (robot, drone or auv)
         """    
+        type_time = self.mission_times(explore_list, self.explored_diary, self.speed_dict)
+
+        # finding fastest transformation type, preference: robot > drone > auv
+        fastest = min(type_time, key=type_time.get)
+
+        return fastest
+
+
+    @staticmethod
+    def mission_times(explore_list, diary, speed_dict):
+        """
+        Simulates the exploration days of a mission for every robot type, leaving the given
+        diary and speed dictionary untouched
+
+        Arguments-
+            explore_list: List of features to explore in the mission
+            diary: features explored so far
+            speed_dict: exploration speeds to start the simulation from
+
+        Returns-
+            type_time (dictionary): exploration days for each robot type
+        """
         type_time = {}
 
         #Looping through different robot types to compute total time taken for each transformation
-        for r_type in self.r_types:
+        for r_type in Robot.r_types:
 
             # Creating a copy of explored_diary for testing
-            simulated_diary = self.explored_diary[:]
+            simulated_diary = list(diary)
             
             # Manually creating a deepcopy of speed dict to be used for simulation best form testing
             simulated_dict = {}
             
-            for robot in self.r_types:
-                simulated_dict[robot] = self.speed_dict[robot].copy()
+            for robot in Robot.r_types:
+                simulated_dict[robot] = speed_dict[robot].copy()
             
             total_days = 0
             
             # Using explpre_time to compute total duration for the mission
             for feature in explore_list:
-                total_days += self.explore_time(r_type, feature, simulated_diary, simulated_dict)
+                total_days += Robot.explore_time(r_type, feature, simulated_diary, simulated_dict)
                 
                 # Appending feature to simulated diary and updating exploration speed after exploring 
                 simulated_diary.append(feature)
                 
-                for robot_type in self.r_types:
+                for robot_type in Robot.r_types:
                     simulated_dict[robot_type][str(feature)] *= 1.2
 
             type_time[r_type] = total_days
 
-        # finding fastest transformation type, preference: robot > drone > auv
-        fastest = min(type_time, key=type_time.get)
+        return type_time
 
-        return fastest
 
+    def snapshot(self):
+        """
+        Captures the current state of the robot for side-effect-free mission evaluation
+
+        Returns-
+            RobotState: frozen copy of the location, diary and exploration speeds
+        """
+        return RobotState(self.location, self.length, self.width,
+                          tuple(self.explored_diary), self.speed_dict)
+
+
+    def evaluate_missions(self, missions, state=None, processes=None):
+        """
+        Scores a batch of candidate missions (travel and best-form exploration) without
+        changing the robot. Every mission is scored independently from the same snapshot.
+
+        Arguments-
+            missions: list of candidate missions, each a list of features to explore
+            state (RobotState): snapshot to evaluate from, defaults to the current state
+            processes (int): number of worker processes, runs in this process if not given
+
+        Returns-
+            list: (total_days, form) tuple for each mission, in the same order
+        """
+        if state is None:
+            state = self.snapshot()
+
+        scorer = partial(score_mission, state)
+
+        if not processes or processes < 2:
+            return [scorer(mission) for mission in missions]
+
+        # Sending missions to the workers in chunks to keep pickling overhead low
+        chunksize = max(1, len(missions) // (processes * 4))
+
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            return list(executor.map(scorer, missions, chunksize=chunksize))
 
-    def explore_time(self, r_type, feature, diary, speed_dict):
+
+    @staticmethod
+    def explore_time(r_type, feature, diary, speed_dict):
         """
         Computes exploration time of a feature based on the type of transformation
 
@@ -295,7 +542,13 @@ class Robot:
         """
         Getter method that returns the log of the journey so far
         """
-        return self.journey
+        return self.journey.lines()
+
+    def get_journey_summary(self):
+        """
+        Getter method that returns the compact log of the journey so far, one entry per leg
+        """
+        return self.journey.summary()
 
     def get_mission_log(self):
         """
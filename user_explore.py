@@ -7,7 +7,11 @@ explore the location if a feature exists there, and view Robbie's journey. The u
 assign a list of missions for Robbie to explore features on Mars.
 """
 
+import argparse
+import os
+
 import geo_features
+import map_tiles
 import robot
 
 def create_map(ref_file):
@@ -46,30 +50,13 @@ def create_map(ref_file):
         # reading through remaining lines and unpacking data 
         for line in lines[1:]:
 
-            data = line.strip().split(",")
-
-            loc_row = int(data[0])
-            loc_col = int(data[1])
-
-            location = (loc_row, loc_col)
-            geo_type = data[2]
-            geo_name = data[3]
-            geo_dimension = int(data[4])
-
-            # Using conditional statements, to create corresponding child class and update
-            # Map list
-            if geo_type == "mountain":
-                geo = geo_features.Mountain(location, geo_name, geo_dimension)
+            # Creating the corresponding child class and updating Map list
+            geo = geo_features.parse_feature(line)
 
-            elif geo_type == "lake":
-                geo = geo_features.Lake(location, geo_name, geo_dimension)
-                
-            elif geo_type == "crater":
-                geo = geo_features.Crater(location, geo_name, geo_dimension)
-
-            else:
+            if geo is None:
                 continue
 
+            loc_row, loc_col = geo.location
             map_list[loc_row][loc_col] = geo 
 
         # replacing None values with GeoFeature base class
@@ -77,28 +64,54 @@ def create_map(ref_file):
             for col in range(map_width):
 
                 if map_list[row][col] is None:
-                    map_list[row][col] = geo_features.Location(row, col)
-
-                    map_list[row][col] = geo_features.GeoFeature(location)
+                    map_list[row][col] = geo_features.GeoFeature((row, col))
 
     return map_list
                 
 
-def show_map(map_list):
+def show_map(map_lookup):
     """
-    Takes map_list as input and prints the map in a graphical form to show the user
+    Takes the map lookup tables as input and prints the map in a graphical form to show the user
 
     Parameters:
-        map_list: list of lists containing geological features of locations
+        map_lookup: FeatureLookup built from the map_list
     """
     
-    # Looping through nested list and displaying output to user
-    for row in map_list:
-        
-        for geo in row:
-            print(geo.get_representation(), end='')
-        
-        print()
+    # Printing each precomputed row of representations
+    for row in map_lookup.representation_rows():
+        print(row)
+
+def show_info(map_lookup, loc_data):
+    """
+    Prints the info for a single location, or for every location in a rectangle when two
+    corners are given
+
+    Parameters:
+        map_lookup: FeatureLookup built from the map_list
+        loc_data (list): coordinates given by the user, either Y X or Y1 X1 Y2 X2
+    """
+    # Rejecting anything other than one location or two corners
+    try:
+        coords = [int(value) for value in loc_data]
+
+    except ValueError:
+        coords = []
+
+    if len(coords) not in (2, 4):
+        print("usage: info Y X or info Y1 X1 Y2 X2")
+        return
+
+    # Single locations and rectangle corners both count negative indices from the end
+    try:
+        if len(coords) == 2:
+            print(map_lookup.get_info(*coords))
+
+        else:
+            for location, info in map_lookup.get_info_region(*coords):
+                print(f"{geo_features.Location(*location)}: {info}")
+
+    except IndexError:
+        print("location is outside the map")
 
 def robot_move(robot_object, target_loc):
     """
@@ -152,27 +165,32 @@ def robot_mission(robot_object, map_list, mission_list):
 
     Parameters- 
         robot_object: Robot object
-        map_list: list of lists containing geological features of locations
+        map_list: list of lists containing geological features of locations, or a TiledMap
         mission_list: list of features/locations to explore in the mission
     """
     # Initializing a feature list and mission object list
     feature_list = []
     mission_object_list = []
 
-    # Taking out features from the map
-    for row in map_list:
-        for feature in row:
-            
-            # Ensuring we only add features, not empty locations
-            if str(feature) != "GeoFeature":
-                feature_list.append(feature)
-    
-    for mission in mission_list:
-        for feature in feature_list:
+    # Tiled maps look features up by name instead of loading every tile
+    if hasattr(map_list, "find_features"):
+        mission_object_list = map_list.find_features(mission_list)
+
+    else:
+        # Taking out features from the map
+        for row in map_list:
+            for feature in row:
                 
-            # Adding corresponding names to new list
-            if feature.name == mission:
-                mission_object_list.append(feature)
+                # Ensuring we only add features, not empty locations
+                if str(feature) != "GeoFeature":
+                    feature_list.append(feature)
+        
+        for mission in mission_list:
+            for feature in feature_list:
+                    
+                # Adding corresponding names to new list
+                if feature.name == mission:
+                    mission_object_list.append(feature)
     
     robot_object.mission_explore(mission_object_list)
         
@@ -187,16 +205,21 @@ def robot_mission(robot_object, map_list, mission_list):
         print ()
 
 
-def display_journey(robot_object):
+def display_journey(robot_object, summary=False):
     """
     Function to display the journey of the Robot so far, by calling the get_journey() method of the 
     Robot class and printing it to display output to the user.
 
     Parameters- 
         robot_object: Robot object
+        summary (bool): show each move by its legs instead of every cell visited
     """
 
-    journey_log = robot_object.get_journey()
+    if summary:
+        journey_log = robot_object.get_journey_summary()
+
+    else:
+        journey_log = robot_object.get_journey()
 
     if journey_log:
         for entry in journey_log:
@@ -204,66 +227,102 @@ def display_journey(robot_object):
     
     else:
         print ()
-  
 
-if __name__ == "__main__":
-    
-    # Creating map using geo_features.txt and initializing Robbie
-    map_list = create_map("geo_features.txt")
 
-    robbie = robot.Robot(map_list)
+def run_command(user_input, robot_object, map_list, map_lookup):
+    """
+    Carries out a single user command, printing its output to the user
 
-    while True:
+    Parameters-
+        user_input (str): command typed by the user
+        robot_object: Robot object
+        map_list: list of lists containing geological features of locations
+        map_lookup: FeatureLookup built from the map_list, or the TiledMap itself
 
-        #Taking user input and making it lowercase
-        user_input = input("> ")
-        lower_input = user_input.strip().lower()
+    Returns-
+        bool: False once the user quits, else True
+    """
+    lower_input = user_input.strip().lower()
 
-        # Using if else conditionals for different possible user inputs 
-        if lower_input == "quit":
-            print("goodbye")
-            break
+    # Using if else conditionals for different possible user inputs 
+    if lower_input == "quit":
+        print("goodbye")
+        return False
 
-        elif lower_input == "show map":
-            
-            # calling show map to display map to user
-            show_map(map_list)
+    elif lower_input == "show map":
+        
+        # calling show map to display map to user
+        show_map(map_lookup)
 
-        elif lower_input.startswith("info "):
-            
-            # unpacking user input into location data and calling get_info to display 
-            # location info to user
-            loc_data = user_input.strip().split()
-            loc_row = int(loc_data[1])
-            loc_col = int(loc_data[2])
+    elif lower_input.startswith("info "):
+        
+        # unpacking user input into location data and looking up location info
+        # for the user, "info Y1 X1 Y2 X2" shows every location in the rectangle
+        loc_data = user_input.strip().split()
 
-            feature = map_list[loc_row][loc_col]
+        show_info(map_lookup, loc_data[1:])
 
-            print(feature.get_info())
+    elif lower_input.startswith("moveto "):
 
-        elif lower_input.startswith("moveto "):
+        # Unpacking user input and gathering target location for movemement
+        move_input = user_input.strip().split()
+        target_loc = (int(move_input[1]), int(move_input[2]))
 
-            # Unpacking user input and gathering target location for movemement
-            move_input = user_input.strip().split()
-            target_loc = (int(move_input[1]), int(move_input[2]))
+        output = robot_move(robot_object, target_loc)
+        print(output)
 
-            output = robot_move(robbie, target_loc)
-            print(output)
+    elif lower_input == "explore":
+        
+        output = robot_explore(robot_object, map_list)
+        print(output)
 
-        elif lower_input == "explore":
-            
-            output = robot_explore(robbie, map_list)
-            print(output)
+    elif lower_input == "display journey":
 
-        elif lower_input == "display journey":
+        display_journey(robot_object)
 
-            display_journey(robbie)
+    elif lower_input == "display journey summary":
 
-        elif lower_input.startswith("mission "):
-            
-            prefix_len = len("mission ")
-            mission_input = user_input[prefix_len:].strip()
+        display_journey(robot_object, summary=True)
+
+    elif lower_input.startswith("mission "):
+        
+        prefix_len = len("mission ")
+        mission_input = user_input[prefix_len:].strip()
+
+        mission_list = [mission.strip() for mission in mission_input.split(",")]
+
+        robot_mission(robot_object, map_list, mission_list)
+
+    return True
+
+
+if __name__ == "__main__":
+    
+    parser = argparse.ArgumentParser(description="Explore Mars with Robbie the robot")
+    parser.add_argument("map", nargs="?", default="geo_features.txt",
+                        help="map file, or a tiled map directory written by map_tiles.py")
+    parser.add_argument("--cache-tiles", type=int, default=64,
+                        help="most tiles of a tiled map held in memory at once")
+    parser.add_argument("--prefetch-workers", type=int, default=4,
+                        help="background threads reading prefetched tiles of a tiled map")
+    args = parser.parse_args()
+
+    # Tiled maps load lazily and answer lookups themselves
+    if os.path.isdir(args.map):
+        map_list = map_tiles.TiledMap(args.map, cache_tiles=args.cache_tiles,
+                                      prefetch_workers=args.prefetch_workers)
+        map_lookup = map_list
+
+    # Creating map using geo_features.txt and building its lookup tables
+    else:
+        map_list = create_map(args.map)
+        map_lookup = geo_features.FeatureLookup(map_list)
+
+    robbie = robot.Robot(map_list)
 
-            mission_list = [mission.strip() for mission in mission_input.split(",")]
+    # Taking user input until the user quits
+    while run_command(input("> "), robbie, map_list, map_lookup):
+        pass
 
-            robot_mission(robbie, map_list, mission_list)
\ No newline at end of file
+    if hasattr(map_list, "close"):
+        map_list.close()